@@ -1,6 +1,6 @@
 """
-generate_data.py
-================
+generate_data_static.py
+=======================
 
 This script reads project data from the Eclipse SDV API or from a local
 JSON file and generates a `data.yml` file in the Landscape2 configuration
@@ -9,46 +9,132 @@ format. The generated YAML can then be used as input for the
 
 Usage::
 
-    python generate_data.py --input projects.json --output data.yml
+    python generate_data_static.py --categories static_categories.yml --output data.yml
 
 If no input JSON is provided, the script attempts to fetch the data
 directly from the API (`https://projects.eclipse.org/api/projects?working_group=sdv&pagesize=90000`).
 
-The script groups projects according to the `category` field in the
-JSON data. If the category follows the pattern ``A / B`` then ``A`` is
-used as the category and ``B`` as the subcategory. Fields that are not
+Projects are organised according to the static category mapping given
+with ``--categories``. Projects missing from the mapping are placed under
+``Unmapped / Misc``. If the categories file does not exist, or
+``--categories ""`` is passed, the script instead groups projects by their
+`category` field: if the category follows the pattern ``A / B`` then ``A``
+is used as the category and ``B`` as the subcategory. Fields that are not
 present in the input are omitted.
 """
 
 import argparse
+import hashlib
 import json
-from collections import defaultdict
-from pathlib import Path
-from typing import Any, Dict, List
+import os
+import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path, PurePath
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
 
 import requests
 import yaml
+from requests.adapters import HTTPAdapter
+
+try:
+    # Prefer the libyaml-backed emitter; it is much faster than the pure
+    # Python one for large landscapes.
+    from yaml import CSafeDumper as Dumper
+except ImportError:
+    from yaml import SafeDumper as Dumper
+
+try:
+    # orjson parses large API responses considerably faster than json
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
 
 API_URL = (
     "https://projects.eclipse.org/api/projects?working_group=sdv&pagesize=90000"
 )
 
+# Maximum number of logos downloaded in parallel
+LOGO_DOWNLOAD_WORKERS = 32
+
+# Logo used for projects without one or whose logo could not be downloaded
+PLACEHOLDER_LOGO = "placeholder.svg"
+
+# Included in the input digest; bump whenever the generated YAML changes for
+# the same input so that existing outputs are regenerated
+GENERATOR_VERSION = 1
+
+
+@dataclass(slots=True)
+class Item:
+    """A landscape item record as written to the YAML file.
+
+    Optional fields left as ``None`` are omitted from the output.
+    """
+
+    name: str | None
+    description: str | None
+    homepage_url: str | None
+    project: str | None = None
+    repo_url: str | None = None
+    logo: str = PLACEHOLDER_LOGO
+
+
+class LandscapeDumper(Dumper):
+    """YAML dumper for the landscape data, able to represent :class:`Item`.
+
+    Representers are registered on this subclass so that the shared PyYAML
+    dumper classes are left unmodified.
+    """
+
+
+def represent_item(dumper: LandscapeDumper, item: Item) -> yaml.Node:
+    """Represent an :class:`Item` as a YAML mapping in field order."""
+    data: Dict[str, Any] = {
+        "name": item.name,
+        "description": item.description,
+        "homepage_url": item.homepage_url,
+    }
+    if item.project is not None:
+        data["project"] = item.project
+    if item.repo_url is not None:
+        data["repo_url"] = item.repo_url
+    data["logo"] = item.logo
+    return dumper.represent_dict(data)
+
+
+LandscapeDumper.add_representer(Item, represent_item)
+
 
-def fetch_projects_from_api() -> List[Dict[str, Any]]:
+def create_session() -> requests.Session:
+    """Create an HTTP session shared by the API request and logo downloads.
+
+    Reusing one session keeps connections alive across requests instead of
+    paying for a new TCP and TLS handshake each time. The connection pool is
+    sized so that every concurrent logo download can hold a connection.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_maxsize=LOGO_DOWNLOAD_WORKERS)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def fetch_projects_from_api(session: requests.Session) -> List[Dict[str, Any]]:
     """Fetch projects from the Eclipse SDV API.
 
     Returns a list of project dictionaries.
     """
-    resp = requests.get(API_URL)
+    resp = session.get(API_URL)
     resp.raise_for_status()
-    return resp.json()
+    return json_loads(resp.content)
 
 
 def load_projects_from_file(path: Path) -> List[Dict[str, Any]]:
     """Load projects from a local JSON file."""
-    with path.open("r", encoding="utf-8") as f:
-        return json.load(f)
+    return json_loads(path.read_bytes())
 
 
 def load_static_categories(path: Path) -> List[Dict[str, Any]]:
@@ -65,74 +151,173 @@ def load_static_categories(path: Path) -> List[Dict[str, Any]]:
     return data.get("categories", [])
 
 
-def download_logo(url: str, dest: Path) -> str:
-    """Download a logo from a URL and save it into dest.
+def compute_input_hash(*inputs: Any) -> str:
+    """Return a stable digest of the given JSON-serializable inputs.
+
+    The digest also covers :data:`GENERATOR_VERSION` and is stored next to
+    the generated YAML file so that unchanged inputs can skip regeneration
+    on subsequent runs.
+    """
+    payload = json.dumps(
+        [GENERATOR_VERSION, *inputs], sort_keys=True
+    ).encode("utf-8")
+    return hashlib.blake2b(payload).hexdigest()
+
+
+def is_up_to_date(out_path: Path, hash_path: Path, input_hash: str) -> bool:
+    """Check whether ``out_path`` was generated from inputs with ``input_hash``."""
+    if not out_path.exists() or not hash_path.exists():
+        return False
+    return hash_path.read_text(encoding="utf-8").strip() == input_hash
+
+
+def load_logo_validators(meta_path: Path, url: str) -> Dict[str, str]:
+    """Build conditional request headers for a previously downloaded logo.
+
+    ``meta_path`` holds the ``ETag`` and ``Last-Modified`` values returned
+    when the logo was last fetched from ``url``. Returns an empty mapping if
+    there is no usable metadata for this URL.
+    """
+    try:
+        meta = json_loads(meta_path.read_bytes())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(meta, dict) or meta.get("url") != url:
+        return {}
+    headers: Dict[str, str] = {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+    return headers
+
+
+def logo_file_name(url: str) -> str:
+    """Choose the file name a logo URL is saved under.
+
+    The last URL segment without query parameters is used, with a short
+    hash of the full URL appended to its stem, e.g. ``logo-1a2b3c4d.png``.
+    The name depends only on the URL itself, so distinct URLs sharing a
+    last segment never overwrite each other and a project's logo name does
+    not change when unrelated projects are added. It does change whenever
+    the logo URL changes; the previously downloaded file is then left in
+    the logo directory and can be removed by hand.
+    """
+    path = PurePath(url.split("/")[-1].split("?")[0])
+    digest = hashlib.blake2b(url.encode("utf-8"), digest_size=4).hexdigest()
+    return f"{path.stem}-{digest}{path.suffix}"
+
+
+def download_logo(
+    session: requests.Session, url: str, dest: Path, file_name: str
+) -> str:
+    """Download a logo from a URL and save it into dest as file_name.
 
     Returns the file name of the saved logo. On failure, returns the
-    placeholder file name. The file is saved in ``dest``.
+    placeholder file name. The file is saved in ``dest`` together with a
+    ``<file name>.meta.json`` sidecar holding the response validators, so
+    that later runs only download the logo again if it has changed.
     """
     try:
-        file_name = url.split("/")[-1].split("?")[0]
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
         file_path = dest / file_name
-        with file_path.open("wb") as f:
-            f.write(response.content)
+        meta_path = dest / f"{file_name}.meta.json"
+        headers: Dict[str, str] = {}
+        if file_path.exists():
+            headers = load_logo_validators(meta_path, url)
+        # Stream the body to disk so large logos are never held in memory
+        with session.get(
+            url, headers=headers, stream=True, timeout=10
+        ) as response:
+            if response.status_code == 304:
+                return file_name
+            response.raise_for_status()
+            response.raw.decode_content = True
+            # Drop the old validators before replacing the logo so they can
+            # never be paired with a file they were not issued for
+            meta_path.unlink(missing_ok=True)
+            # Write to a temporary file first so that a failed transfer
+            # leaves any previously downloaded logo intact
+            tmp_path = dest / f".{file_name}.part"
+            try:
+                with tmp_path.open("wb") as f:
+                    shutil.copyfileobj(response.raw, f, length=64 * 1024)
+                os.replace(tmp_path, file_path)
+            finally:
+                tmp_path.unlink(missing_ok=True)
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            meta = {"url": url, "etag": etag, "last_modified": last_modified}
+            try:
+                meta_path.write_text(json.dumps(meta), encoding="utf-8")
+            except OSError:
+                # The logo itself is in place; without validators the next
+                # run simply downloads it again
+                meta_path.unlink(missing_ok=True)
         return file_name
     except Exception:
-        return "placeholder.svg"
+        return PLACEHOLDER_LOGO
+
+
+def download_logos(
+    session: requests.Session, urls: List[str], dest: Path
+) -> Dict[str, str]:
+    """Download logos from several URLs concurrently into dest.
+
+    Returns a mapping from each URL to the file name returned by
+    :func:`download_logo`. Every URL is saved to a distinct file, see
+    :func:`logo_file_name`, so no two downloads write to the same path.
+    """
+    with ThreadPoolExecutor(max_workers=LOGO_DOWNLOAD_WORKERS) as executor:
+        saved_names = executor.map(
+            lambda url: download_logo(session, url, dest, logo_file_name(url)),
+            urls,
+        )
+        return dict(zip(urls, saved_names))
 
 
 def build_landscape_from_static(
     projects: List[Dict[str, Any]],
     static_categories: List[Dict[str, Any]],
-    logo_dir: Path | None = None,
-) -> Dict[str, Any]:
+    logo_files: Dict[str, str] | None = None,
+) -> Iterator[Dict[str, Any]]:
     """Build landscape data using a static category mapping.
 
     Projects are looked up by name according to the items lists in the
-    supplied `static_categories`. Any project not found in the mapping
-    will be placed into a fallback "Misc" subcategory under an
-    automatically created "Unmapped" category.
-
-    If ``logo_dir`` is provided, logos are downloaded into this directory
-    and only the file name is referenced in the YAML. Otherwise, full
-    URLs or the placeholder value are used.
+    supplied `static_categories` and the resulting categories are yielded
+    one at a time. Any project not found in the mapping will be placed
+    into a fallback "Misc" subcategory under an automatically created
+    "Unmapped" category.
+
+    If ``logo_files`` is provided, it maps logo URLs to the file names of
+    the downloaded logos (see :func:`download_logos`) and only the file name
+    is referenced in the YAML. Otherwise, full URLs or the placeholder
+    value are used.
     """
     # Prepare lookup of projects by name
     projects_by_name: Dict[str, Dict[str, Any]] = {p.get("name"): p for p in projects}
     assigned: set[str] = set()
 
-    # Ensure logo directory exists if specified
-    if logo_dir is not None:
-        logo_dir.mkdir(parents=True, exist_ok=True)
-
-    output_categories: List[Dict[str, Any]] = []
-
-    def build_item(project: Dict[str, Any]) -> Dict[str, Any]:
+    def build_item(project: Dict[str, Any]) -> Item:
         """Construct a landscape item record from project data."""
-        item: Dict[str, Any] = {
-            "name": project.get("name"),
-            "description": project.get("summary"),
-            "homepage_url": project.get("url"),
-        }
+        item = Item(
+            name=project.get("name"),
+            description=project.get("summary"),
+            homepage_url=project.get("url"),
+        )
         state = project.get("state")
         if state:
-            item["project"] = state
+            item.project = sys.intern(state)
         repos = project.get("github_repos") or []
         if repos:
             repo_url = repos[0].get("url")
             if repo_url:
-                item["repo_url"] = repo_url
+                item.repo_url = repo_url
         logo_url = project.get("logo")
-        if logo_dir is not None and logo_url:
-            file_name = download_logo(logo_url, logo_dir)
-            item["logo"] = file_name
-        else:
-            if logo_url:
-                item["logo"] = logo_url
-            else:
-                item["logo"] = "placeholder.svg"
+        if logo_files is not None and logo_url:
+            item.logo = logo_files[logo_url]
+        elif logo_url:
+            item.logo = logo_url
         return item
 
     # Build categories and subcategories according to static mapping
@@ -148,10 +333,10 @@ def build_landscape_from_static(
                     new_sub["items"].append(build_item(proj_data))
                     assigned.add(proj_name)
             new_cat["subcategories"].append(new_sub)
-        output_categories.append(new_cat)
+        yield new_cat
 
     # Handle projects that were not assigned to any static category
-    unassigned_items: List[Dict[str, Any]] = []
+    unassigned_items: List[Item] = []
     for proj_name, proj_data in projects_by_name.items():
         if proj_name not in assigned:
             unassigned_items.append(build_item(proj_data))
@@ -166,15 +351,13 @@ def build_landscape_from_static(
                 }
             ],
         }
-        output_categories.append(misc_category)
-
-    return {"categories": output_categories}
+        yield misc_category
 
 
 def build_landscape_from_dynamic(
     projects: List[Dict[str, Any]],
-    logo_dir: Path | None = None,
-) -> Dict[str, Any]:
+    logo_files: Dict[str, str] | None = None,
+) -> Iterator[Dict[str, Any]]:
     """Fallback dynamic grouping using the project's 'category' field.
 
     This function replicates the original behaviour of grouping projects by
@@ -183,81 +366,104 @@ def build_landscape_from_dynamic(
     placed under a subcategory named "Misc". Projects lacking a
     category are placed under "Unknown/Misc".
 
-    If ``logo_dir`` is provided, logo URLs are downloaded into this
-    directory and the ``logo`` field references only the file name.
-    Otherwise, the full URL or placeholder is used.
+    If ``logo_files`` is provided, it maps logo URLs to the file names of
+    the downloaded logos and the ``logo`` field references only the file
+    name. Otherwise, the full URL or placeholder is used.
     """
-    categories: Dict[str, Dict[str, Any]] = {}
-
-    # Ensure logo directory exists if specified
-    if logo_dir is not None:
-        logo_dir.mkdir(parents=True, exist_ok=True)
+    # Categories in first-seen order, already in the list structure required
+    # by YAML, plus lookups to append items to them directly
+    category_list: List[Dict[str, Any]] = []
+    subcats_by_category: Dict[str, List[Dict[str, Any]]] = {}
+    items_by_subcat: Dict[Tuple[str, str], List[Item]] = {}
 
     for proj in projects:
         # Determine category and subcategory names
         cat_str: str = proj.get("category", "Unknown")
-        parts = [part.strip() for part in cat_str.split("/", maxsplit=1)]
-        if len(parts) == 2:
-            cat_name, subcat_name = parts
-        else:
-            cat_name = parts[0]
-            subcat_name = "Misc"
-
-        # Ensure category entry exists
-        category = categories.setdefault(
-            cat_name, {"name": cat_name, "subcategories": {}}
-        )
-        subcats = category["subcategories"]
-        # Ensure subcategory entry exists
-        subcat = subcats.setdefault(
-            subcat_name, {"name": subcat_name, "items": []}
-        )
+        head, sep, tail = cat_str.partition("/")
+        # Names repeat across many projects; interning shares one string
+        # object per name and speeds up the lookups keyed on them
+        cat_name = sys.intern(head.strip())
+        subcat_name = sys.intern(tail.strip()) if sep else "Misc"
 
         # Build item record
-        item: Dict[str, Any] = {
-            "name": proj.get("name"),
-            "description": proj.get("summary"),
-            "homepage_url": proj.get("url"),
-        }
+        item = Item(
+            name=proj.get("name"),
+            description=proj.get("summary"),
+            homepage_url=proj.get("url"),
+        )
 
         # Map project state to the ``project`` field
         state = proj.get("state")
         if state:
-            item["project"] = state
+            item.project = sys.intern(state)
 
         # Add first GitHub repo URL if available
         repos = proj.get("github_repos") or []
         if repos:
             repo_url = repos[0].get("url")
             if repo_url:
-                item["repo_url"] = repo_url
+                item.repo_url = repo_url
 
         # Handle logo
         logo_url = proj.get("logo")
-        if logo_dir is not None and logo_url:
-            # Download logo and use only the file name in YAML
-            file_name = download_logo(logo_url, logo_dir)
-            item["logo"] = file_name
-        else:
-            # Without download, keep full URL or fallback
-            if logo_url:
-                item["logo"] = logo_url
-            else:
-                item["logo"] = "placeholder.svg"
-
-        # Append item to subcategory
-        subcat["items"].append(item)
-
-    # Convert nested dict of subcategories to list structure required by YAML
-    category_list = []
-    for cat in categories.values():
-        subcat_list = []
-        for subcat in cat["subcategories"].values():
-            subcat_list.append(subcat)
-        cat["subcategories"] = subcat_list
-        category_list.append(cat)
-
-    return {"categories": category_list}
+        if logo_files is not None and logo_url:
+            # Use only the file name of the downloaded logo in YAML
+            item.logo = logo_files[logo_url]
+        elif logo_url:
+            # Without download, keep full URL; Item falls back to the
+            # placeholder otherwise
+            item.logo = logo_url
+
+        # Append item to subcategory, creating both levels on first use
+        key = (cat_name, subcat_name)
+        try:
+            items = items_by_subcat[key]
+        except KeyError:
+            subcats = subcats_by_category.get(cat_name)
+            if subcats is None:
+                subcats = subcats_by_category[cat_name] = []
+                category_list.append({"name": cat_name, "subcategories": subcats})
+            items = items_by_subcat[key] = []
+            subcats.append({"name": subcat_name, "items": items})
+        items.append(item)
+
+    yield from category_list
+
+
+def write_landscape_yaml(categories: Iterable[Dict[str, Any]], out_path: Path) -> None:
+    """Write categories to ``out_path`` in the Landscape2 YAML format.
+
+    Categories are emitted one at a time below the top-level ``categories``
+    key, so the emitter only ever holds a single category. The result is
+    identical to dumping the whole ``{"categories": [...]}`` document. The
+    emitter encodes to UTF-8 itself and writes bytes straight to the file.
+
+    The YAML is written to a temporary file next to ``out_path`` and only
+    moved into place once complete, so an error while the categories are
+    being built leaves any previous ``out_path`` untouched.
+    """
+    tmp_path = out_path.with_name(f".{out_path.name}.tmp")
+    try:
+        with tmp_path.open("wb") as f:
+            empty = True
+            for category in categories:
+                if empty:
+                    f.write(b"categories:\n")
+                    empty = False
+                yaml.dump(
+                    [category],
+                    f,
+                    Dumper=LandscapeDumper,
+                    encoding="utf-8",
+                    sort_keys=False,
+                    allow_unicode=True,
+                    default_flow_style=False,
+                )
+            if empty:
+                f.write(b"categories: []\n")
+        os.replace(tmp_path, out_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
 
 
 def main() -> None:
@@ -276,44 +482,73 @@ def main() -> None:
         default="static_categories.yml",
         help=(
             "Path to a YAML file defining static categories. If provided, the script"
-            " will organise projects according to this file. If not present,"
-            " projects are grouped using their 'category' field."
+            " will organise projects according to this file. If not present or"
+            " empty, projects are grouped using their 'category' field."
         ),
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Regenerate the YAML file even if the input data is unchanged",
+    )
     args = parser.parse_args()
 
-    # Load projects
-    if args.input:
-        projects = load_projects_from_file(Path(args.input))
-    else:
-        projects = fetch_projects_from_api()
-
-    # Download logos into a local 'logos' directory and reference them in YAML
-    logo_dir = Path("logos")
-    # If a categories file exists, load it; otherwise use dynamic grouping
-    categories_path = Path(args.categories)
-    if categories_path.exists():
-        static_categories = load_static_categories(categories_path)
-        landscape_data = build_landscape_from_static(
-            projects, static_categories, logo_dir=logo_dir
-        )
-    else:
-        # Fall back to dynamic grouping if no categories file is provided
-        landscape_data = build_landscape_from_dynamic(
-            projects, logo_dir=logo_dir
-        )
-
-    # Write YAML file
-    out_path = Path(args.output)
-    with out_path.open("w", encoding="utf-8") as f:
-        yaml.dump(
-            landscape_data,
-            f,
-            sort_keys=False,
-            allow_unicode=True,
-            default_flow_style=False,
+    with create_session() as session:
+        # Load projects
+        if args.input:
+            projects = load_projects_from_file(Path(args.input))
+        else:
+            projects = fetch_projects_from_api(session)
+
+        # If a categories file exists, load it; otherwise use dynamic grouping
+        static_categories = None
+        if args.categories and Path(args.categories).exists():
+            static_categories = load_static_categories(Path(args.categories))
+
+        # Download logos into a local 'logos' directory and reference them in
+        # YAML. Projects often share a logo, so fetch each distinct URL once.
+        # This runs on every invocation: unchanged logos only cost a
+        # conditional request, while missing or updated ones are fetched.
+        logo_dir = Path("logos")
+        logo_dir.mkdir(parents=True, exist_ok=True)
+        logo_urls = list(
+            dict.fromkeys(proj["logo"] for proj in projects if proj.get("logo"))
         )
-    print(f"Generated {out_path}")
+        logo_files = download_logos(session, logo_urls, logo_dir)
+
+        # Skip regeneration if the output was produced from the same input
+        # and references the same logo files
+        out_path = Path(args.output)
+        hash_path = out_path.with_name(out_path.name + ".hash")
+        input_hash = compute_input_hash(projects, static_categories, logo_files)
+        if not args.force and is_up_to_date(out_path, hash_path, input_hash):
+            print(f"{out_path} is up to date")
+            return
+
+        # Remove the old digest first so that a run that fails part way is
+        # never mistaken for an up to date one
+        hash_path.unlink(missing_ok=True)
+
+        if static_categories is not None:
+            categories = build_landscape_from_static(
+                projects, static_categories, logo_files=logo_files
+            )
+        else:
+            # Fall back to dynamic grouping if no categories file is provided
+            categories = build_landscape_from_dynamic(
+                projects, logo_files=logo_files
+            )
+
+        # Write YAML file
+        write_landscape_yaml(categories, out_path)
+        print(f"Generated {out_path}")
+
+        # Only record the digest if every logo was downloaded, so that logos
+        # replaced by the placeholder are retried on the next run
+        if PLACEHOLDER_LOGO in logo_files.values():
+            print("Some logos could not be downloaded; they will be retried")
+        else:
+            hash_path.write_text(input_hash + "\n", encoding="utf-8")
 
 
 if __name__ == "__main__":